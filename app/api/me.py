@@ -0,0 +1,72 @@
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from ..database import get_db_connection
+from ..auth.dependencies import get_current_user
+from ..sql.dashboard import (
+    GET_RENTER_DASHBOARD_VERSION,
+    GET_RENTER_DASHBOARD,
+    GET_MANAGER_DASHBOARD_VERSION,
+    GET_MANAGER_DASHBOARD
+)
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+def _dashboard_etag(*parts) -> str:
+    body = json.dumps(parts, default=str, sort_keys=True)
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+def _etag_matches(etag: str, if_none_match: str = None) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+# Endpoint returning everything a dashboard needs in a single round trip
+@router.get("/dashboard")
+async def get_my_dashboard(
+    payments_limit: int = Query(10, ge=1, le=100),
+    if_none_match: str = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    realm = current_user.get("realm")
+    username = current_user.get("username")
+    role = current_user.get("role")
+    if not realm or not username:
+        raise HTTPException(status_code=403, detail="Invalid user.")
+    if role not in ("boarding_managers", "boarding_tenants"):
+        raise HTTPException(status_code=403, detail="No dashboard available for this role.")
+
+    async with get_db_connection() as conn:
+        # One snapshot, so the ETag describes exactly the data returned
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            if role == "boarding_managers":
+                version = await conn.fetchrow(GET_MANAGER_DASHBOARD_VERSION, realm)
+            else:
+                version = await conn.fetchrow(GET_RENTER_DASHBOARD_VERSION, username, realm)
+
+            etag = _dashboard_etag(role, username, payments_limit, dict(version))
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if _etag_matches(etag, if_none_match):
+                return Response(status_code=304, headers=headers)
+
+            if role == "boarding_managers":
+                summary = await conn.fetchrow(GET_MANAGER_DASHBOARD, realm)
+                data = {"role": role, **dict(summary)}
+            else:
+                dashboard = await conn.fetchrow(GET_RENTER_DASHBOARD, username, realm, payments_limit)
+                data = {
+                    "role": role,
+                    "active_contract": json.loads(dashboard["active_contract"]) if dashboard["active_contract"] else None,
+                    "recent_payments": json.loads(dashboard["recent_payments"]),
+                    "pending_count": dashboard["pending_count"],
+                    "outstanding_balance": dashboard["outstanding_balance"] or 0,
+                }
+
+    return JSONResponse(content=jsonable_encoder(data), headers=headers)
@@ -1,15 +1,18 @@
 import os
 import shutil
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Header
+from fastapi.responses import StreamingResponse
 from datetime import date, datetime
 
 from ..database import get_db_connection
 from ..auth.dependencies import get_current_user
+from ..events import PAYMENT_EVENTS_CHANNEL, build_payment_event
 from ..sql.payments import (
     CREATE_PAYMENT,
     GET_PENDING_PAYMENTS_BY_REALM,
     APPROVE_PAYMENT,
-    GET_PAYMENTS_BY_TENANT
+    GET_PAYMENTS_BY_TENANT,
+    NOTIFY_PAYMENT_EVENT
 )
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -54,18 +57,28 @@ async def upload_payment_proof(
             raise HTTPException(status_code=404, detail="Contract not found for this user and realm.")
 
         payment_number = f"PAY-{timestamp}-{contract_id}"
-        payment_id = await conn.fetchval(
-            CREATE_PAYMENT,
-            realm,
-            contract_id,
-            payment_number,
-            amount,
-            payment_date,
-            "Bank Transfer", # Assuming method for now
-            notes,
-            username,
-            file_path
-        )
+        # The NOTIFY is only delivered if the insert commits with it
+        async with conn.transaction():
+            payment_id = await conn.fetchval(
+                CREATE_PAYMENT,
+                realm,
+                contract_id,
+                payment_number,
+                amount,
+                payment_date,
+                "Bank Transfer", # Assuming method for now
+                notes,
+                username,
+                file_path
+            )
+            await conn.execute(
+                NOTIFY_PAYMENT_EVENT,
+                PAYMENT_EVENTS_CHANNEL,
+                build_payment_event(
+                    "payment_uploaded", realm, payment_id,
+                    contract_id=contract_id, amount=float(amount), created_by=username
+                )
+            )
         return {"id": payment_id, "message": "Payment proof uploaded successfully. Awaiting approval."}
 
 # Endpoint for managers to approve a payment
@@ -79,9 +92,19 @@ async def approve_payment(
         raise HTTPException(status_code=403, detail="Only managers of a realm can approve payments.")
 
     async with get_db_connection() as conn:
-        res = await conn.execute(APPROVE_PAYMENT, payment_id, realm)
-        if res == "UPDATE 0":
-            raise HTTPException(status_code=404, detail="Payment not found or access denied.")
+        # The NOTIFY is only delivered if the approval commits with it
+        async with conn.transaction():
+            payment = await conn.fetchrow(APPROVE_PAYMENT, payment_id, realm)
+            if not payment:
+                raise HTTPException(status_code=404, detail="Payment not found or access denied.")
+            await conn.execute(
+                NOTIFY_PAYMENT_EVENT,
+                PAYMENT_EVENTS_CHANNEL,
+                build_payment_event(
+                    "payment_approved", realm, payment_id,
+                    contract_id=payment["contract_id"], amount=float(payment["amount"])
+                )
+            )
         return {"message": f"Payment {payment_id} has been approved."}
 
 # Endpoint for managers to see pending payments
@@ -97,6 +120,24 @@ async def get_pending_payments(
         payments = await conn.fetch(GET_PENDING_PAYMENTS_BY_REALM, realm)
         return [dict(payment) for payment in payments]
 
+# Endpoint for managers to receive pending-payment updates as Server-Sent Events
+@router.get("/stream")
+async def stream_payment_events(
+    request: Request,
+    last_event_id: str = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    realm = current_user.get("realm")
+    if current_user.get("role") != "boarding_managers" or not realm:
+        raise HTTPException(status_code=403, detail="Only managers of a realm can subscribe to payment events.")
+
+    broker = request.app.state.event_broker
+    return StreamingResponse(
+        broker.stream(realm, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/my")
 async def get_my_payments(current_user: dict = Depends(get_current_user)):
     realm = current_user.get("realm")
@@ -0,0 +1,203 @@
+import asyncio
+import json
+from collections import defaultdict, deque
+
+import asyncpg
+
+from .config import get_settings
+
+settings = get_settings()
+
+PAYMENT_EVENTS_CHANNEL = "payment_events"
+
+# How many recent events per realm are kept for Last-Event-ID replay
+EVENT_BACKLOG_SIZE = 100
+# How many undelivered events a single client may fall behind by;
+# at least EVENT_BACKLOG_SIZE so a full replay always fits
+SUBSCRIBER_QUEUE_SIZE = EVENT_BACKLOG_SIZE
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+# Seconds to wait before re-opening a dropped LISTEN connection
+RECONNECT_DELAY = 5
+# Seconds after which a stream ends on its own and the client reconnects
+# with Last-Event-ID. uvicorn waits for open responses before running the
+# shutdown handlers, so this bounds how long a stream can hold up a restart.
+STREAM_MAX_LIFETIME = 60
+
+# Tells a client that events may have been missed and it should reload:
+# sent after the LISTEN connection was re-established, and on resume when
+# this worker no longer holds every event after the client's Last-Event-ID.
+RESET_EVENT = {"type": "reset"}
+
+
+def build_payment_event(event_type: str, realm: str, payment_id: int, **data):
+    # The event id is not set here: NOTIFY_PAYMENT_EVENT takes it from a
+    # database sequence so all workers see one ordered series of ids.
+    return json.dumps({
+        "type": event_type,
+        "realm": realm,
+        "payment_id": payment_id,
+        **data,
+    })
+
+
+def _parse_event_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PaymentEventBroker:
+    """Holds one LISTEN connection per worker and fans payment events
+    out to the SSE clients of each realm."""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._conn = None
+        self._subscribers = defaultdict(set)
+        self._overflowed = set()
+        self._backlog = defaultdict(lambda: deque(maxlen=EVENT_BACKLOG_SIZE))
+        # Lowest event id received on the current LISTEN connection
+        self._first_event_id = None
+        self._reconnect_task = None
+        self._closed = False
+
+    async def start(self):
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            await conn.add_listener(PAYMENT_EVENTS_CHANNEL, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    async def close(self):
+        self._closed = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._conn and not self._conn.is_closed():
+            await self._conn.close()
+
+    def _on_terminated(self, connection):
+        if self._closed:
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        while not self._closed:
+            await asyncio.sleep(RECONNECT_DELAY)
+            try:
+                await self.start()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                continue
+            # Events sent while disconnected are gone, so the backlog has a
+            # gap; start a fresh one that only vouches for the new connection.
+            self._backlog.clear()
+            self._first_event_id = None
+            self._broadcast(RESET_EVENT)
+            return
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        if not isinstance(event, dict):
+            return
+        realm = event.get("realm")
+        event_id = _parse_event_id(event.get("id"))
+        if not realm or event_id is None:
+            return
+        event["id"] = event_id
+        if self._first_event_id is None or event_id < self._first_event_id:
+            self._first_event_id = event_id
+        self._backlog[realm].append(event)
+        for queue in list(self._subscribers.get(realm, ())):
+            self._deliver(queue, event)
+
+    def _broadcast(self, event):
+        for queues in list(self._subscribers.values()):
+            for queue in list(queues):
+                self._deliver(queue, event)
+
+    def _deliver(self, queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is not keeping up; end its stream so it reconnects
+            # with Last-Event-ID and catches up from the backlog, or is told
+            # to reload if the backlog no longer reaches back that far.
+            self._overflowed.add(queue)
+            for queues in self._subscribers.values():
+                queues.discard(queue)
+
+    def subscribe(self, realm: str, last_event_id: str = None):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        last_id = _parse_event_id(last_event_id)
+        if last_id is not None:
+            if self._can_replay(realm, last_id):
+                # Replay whatever the client missed while it was disconnected
+                missed = sorted(
+                    (event for event in self._backlog[realm] if event["id"] > last_id),
+                    key=lambda event: event["id"]
+                )
+                for event in missed:
+                    queue.put_nowait(event)
+            else:
+                queue.put_nowait(RESET_EVENT)
+        self._subscribers[realm].add(queue)
+        return queue
+
+    def _can_replay(self, realm: str, last_id: int):
+        # Events after last_id may predate this LISTEN connection, or may
+        # already have been pushed out of a full backlog.
+        if self._first_event_id is None or last_id < self._first_event_id:
+            return False
+        backlog = self._backlog.get(realm, ())
+        if len(backlog) == EVENT_BACKLOG_SIZE:
+            return last_id >= min(event["id"] for event in backlog)
+        return True
+
+    def unsubscribe(self, realm: str, queue):
+        self._overflowed.discard(queue)
+        subscribers = self._subscribers.get(realm)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[realm]
+
+    async def stream(self, realm: str, last_event_id: str = None):
+        queue = self.subscribe(realm, last_event_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STREAM_MAX_LIFETIME
+        try:
+            yield f"retry: {RECONNECT_DELAY * 1000}\n\n"
+            while not self._closed and not (queue in self._overflowed and queue.empty()):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), min(HEARTBEAT_INTERVAL, remaining))
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            self.unsubscribe(realm, queue)
+
+
+def format_sse(event: dict):
+    lines = []
+    if "id" in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def get_event_broker():
+    return PaymentEventBroker(settings.database_url)
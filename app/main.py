@@ -1,8 +1,9 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from .api import rooms, contracts, payments, renters, auth
+from .api import rooms, contracts, payments, renters, auth, me
 from .database import get_db_pool
+from .events import get_event_broker
 import os
 
 app = FastAPI(title="Boarding House Management API")
@@ -23,13 +24,17 @@ app.include_router(rooms.router)
 app.include_router(contracts.router)
 app.include_router(payments.router)
 app.include_router(renters.router)
+app.include_router(me.router)
 
 @app.on_event("startup")
 async def startup():
     app.state.pool = await get_db_pool()
+    app.state.event_broker = get_event_broker()
+    await app.state.event_broker.start()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await app.state.event_broker.close()
     await app.state.pool.close()
 
 # Catch-all to serve the Next.js app's index.html
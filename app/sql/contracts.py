@@ -28,6 +28,12 @@ GET_ALL_CONTRACTS_BY_REALM = """
     SELECT * FROM contracts WHERE realm = $1 ORDER BY start_date DESC;
 """
 
-GET_ACTIVE_CONTRACT_BY_TENANT = """
-    SELECT * FROM contracts WHERE tenant_username = $1 AND status = 'active' AND realm = $2;
-"""
\ No newline at end of file
+# Shared by /contracts/my/active and /me/dashboard so both pick the same contract
+ACTIVE_CONTRACT_BY_TENANT = """
+    SELECT * FROM contracts
+    WHERE tenant_username = $1 AND status = 'active' AND realm = $2
+    ORDER BY start_date DESC, id DESC
+    LIMIT 1
+"""
+
+GET_ACTIVE_CONTRACT_BY_TENANT = f"{ACTIVE_CONTRACT_BY_TENANT};"
\ No newline at end of file
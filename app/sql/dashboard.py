@@ -0,0 +1,87 @@
+# SQL Queries for the aggregated dashboards
+
+from .contracts import ACTIVE_CONTRACT_BY_TENANT
+
+# Outstanding balance of contract c: rent due so far (contract_amount_due,
+# defined in boarding_house_schema_extension.sql) minus every approved
+# payment on the contract, whoever recorded it.
+CONTRACT_BALANCE = """
+    contract_amount_due(c.start_date, c.end_date, c.monthly_rate) - COALESCE((
+        SELECT SUM(p.amount) FROM payments p
+        WHERE p.contract_id = c.id AND p.status = 'approved'
+    ), 0)
+"""
+
+# The *_VERSION queries are cheap fingerprints of everything the matching
+# dashboard depends on; they are used for the ETag so an unchanged
+# dashboard can be answered with 304 without running the aggregate.
+
+GET_RENTER_DASHBOARD_VERSION = f"""
+    WITH active_contract AS ({ACTIVE_CONTRACT_BY_TENANT})
+    SELECT
+        CURRENT_DATE AS today,
+        c.id AS contract_id,
+        c.updated_at AS contract_updated_at,
+        COUNT(p.id) AS payment_count,
+        MAX(p.id) AS last_payment_id,
+        COUNT(p.id) FILTER (WHERE p.status = 'approved') AS approved_count
+    FROM (SELECT 1) AS one
+    LEFT JOIN active_contract c ON TRUE
+    LEFT JOIN payments p ON p.realm = $2
+        AND (p.created_by = $1 OR p.contract_id = c.id)
+    GROUP BY c.id, c.updated_at;
+"""
+
+GET_RENTER_DASHBOARD = f"""
+    WITH active_contract AS ({ACTIVE_CONTRACT_BY_TENANT}),
+    tenant_payments AS (
+        SELECT * FROM payments WHERE created_by = $1 AND realm = $2
+    )
+    SELECT
+        (SELECT row_to_json(c) FROM active_contract c) AS active_contract,
+        (
+            SELECT COALESCE(json_agg(p ORDER BY p.payment_date DESC, p.id DESC), '[]'::json)
+            FROM (
+                SELECT * FROM tenant_payments
+                ORDER BY payment_date DESC, id DESC
+                LIMIT $3
+            ) p
+        ) AS recent_payments,
+        (SELECT COUNT(*) FROM tenant_payments WHERE status = 'pending') AS pending_count,
+        (SELECT {CONTRACT_BALANCE} FROM active_contract c) AS outstanding_balance;
+"""
+
+GET_MANAGER_DASHBOARD_VERSION = """
+    SELECT
+        CURRENT_DATE AS today,
+        (SELECT COUNT(*) FROM rooms WHERE realm = $1) AS room_count,
+        (SELECT MAX(updated_at) FROM rooms WHERE realm = $1) AS rooms_updated_at,
+        (SELECT COUNT(*) FROM contracts WHERE realm = $1) AS contract_count,
+        (SELECT MAX(updated_at) FROM contracts WHERE realm = $1) AS contracts_updated_at,
+        p.payment_count,
+        p.last_payment_id,
+        p.approved_count
+    FROM (
+        SELECT
+            COUNT(*) AS payment_count,
+            MAX(id) AS last_payment_id,
+            COUNT(*) FILTER (WHERE status = 'approved') AS approved_count
+        FROM payments WHERE realm = $1
+    ) p;
+"""
+
+GET_MANAGER_DASHBOARD = f"""
+    WITH contract_balances AS (
+        SELECT c.id, {CONTRACT_BALANCE} AS balance
+        FROM contracts c
+        WHERE c.realm = $1 AND c.status = 'active'
+    )
+    SELECT
+        (SELECT COUNT(*) FROM rooms WHERE realm = $1) AS total_rooms,
+        (SELECT COUNT(*) FROM rooms WHERE realm = $1 AND status = 'occupied') AS occupied_rooms,
+        (SELECT COUNT(*) FROM rooms WHERE realm = $1 AND status = 'available') AS available_rooms,
+        (SELECT COUNT(*) FROM contract_balances) AS active_contracts,
+        (SELECT COUNT(*) FROM payments WHERE realm = $1 AND status = 'pending') AS pending_count,
+        (SELECT COUNT(*) FROM contract_balances WHERE balance > 0) AS contracts_in_arrears,
+        (SELECT COALESCE(SUM(balance), 0) FROM contract_balances WHERE balance > 0) AS total_arrears;
+"""
@@ -11,9 +11,17 @@ GET_PENDING_PAYMENTS_BY_REALM = """
 """
 
 APPROVE_PAYMENT = """
-    UPDATE payments SET status = 'approved' WHERE id = $1 AND realm = $2;
+    UPDATE payments SET status = 'approved' WHERE id = $1 AND realm = $2
+    RETURNING id, contract_id, amount;
 """
 
 GET_PAYMENTS_BY_TENANT = """
     SELECT * FROM payments WHERE created_by = $1 AND realm = $2 ORDER BY payment_date DESC;
 """
+
+NOTIFY_PAYMENT_EVENT = """
+    SELECT pg_notify(
+        $1,
+        (jsonb_build_object('id', nextval('payment_event_id_seq')) || $2::jsonb)::text
+    );
+"""
@@ -47,11 +47,16 @@ CREATE TABLE payments (
     notes TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     created_by VARCHAR(64) NOT NULL, -- References manager's username
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    proof_of_payment_url TEXT,
     CONSTRAINT fk_contract FOREIGN KEY(contract_id) REFERENCES contracts(id),
     CONSTRAINT fk_created_by FOREIGN KEY(created_by) REFERENCES radusergroup(username),
     CONSTRAINT unique_payment_per_realm UNIQUE(realm, payment_number)
 );
 
+-- Sequence giving payment NOTIFY events one ordered series of ids
+CREATE SEQUENCE payment_event_id_seq;
+
 -- Create indexes for better query performance
 CREATE INDEX idx_rooms_status ON rooms(status);
 CREATE INDEX idx_rooms_realm ON rooms(realm);
@@ -85,4 +90,22 @@ CREATE TRIGGER update_rooms_updated_at
 CREATE TRIGGER update_contracts_updated_at
     BEFORE UPDATE ON contracts
     FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Rent owed on a contract as of a date: one monthly_rate per billing month
+-- started between start_date and as_of, capped at end_date
+CREATE OR REPLACE FUNCTION contract_amount_due(
+    start_date DATE,
+    end_date DATE,
+    monthly_rate DECIMAL,
+    as_of DATE DEFAULT CURRENT_DATE
+)
+RETURNS DECIMAL AS $$
+    SELECT CASE
+        WHEN start_date > as_of THEN 0
+        ELSE monthly_rate * (
+            EXTRACT(YEAR FROM AGE(LEAST(as_of, end_date), start_date)) * 12
+            + EXTRACT(MONTH FROM AGE(LEAST(as_of, end_date), start_date)) + 1
+        )::int
+    END;
+$$ LANGUAGE sql STABLE;
\ No newline at end of file
@@ -1,9 +1,59 @@
 'use client';
 
+import { useCallback, useEffect, useState } from 'react';
 import { useAuth } from '../../../context/AuthContext';
+import apiClient from '../../../lib/api';
+import { subscribePaymentEvents } from '../../../lib/paymentEvents';
 
 export default function ManagerDashboard() {
   const { user } = useAuth();
+  const [pendingPayments, setPendingPayments] = useState([]);
+  const [summary, setSummary] = useState(null);
+  const [streamError, setStreamError] = useState(null);
+  const [pendingError, setPendingError] = useState(null);
+  const [summaryError, setSummaryError] = useState(null);
+
+  const loadPendingPayments = useCallback(async () => {
+    try {
+      const response = await apiClient.get('/payments/pending');
+      setPendingPayments(response.data);
+      setPendingError(null);
+    } catch (error) {
+      setPendingError('Could not load pending payments. Please try again or log in again.');
+    }
+  }, []);
+
+  // Occupancy, pending count and arrears from GET /me/dashboard; the
+  // browser revalidates it with the ETag, so unchanged data costs a 304.
+  const loadSummary = useCallback(async () => {
+    try {
+      const response = await apiClient.get('/me/dashboard');
+      setSummary(response.data);
+      setSummaryError(null);
+    } catch (error) {
+      setSummaryError('Could not load the dashboard summary. Please try again or log in again.');
+    }
+  }, []);
+
+  // Load the pending list once the payment event stream is open, then keep
+  // it current from the stream instead of polling GET /payments/pending.
+  useEffect(() => {
+    if (!user) return;
+    return subscribePaymentEvents(event => {
+      if (event.type === 'payment_uploaded' || event.type === 'reset') {
+        loadPendingPayments();
+      } else if (event.type === 'payment_approved') {
+        setPendingPayments(payments => payments.filter(p => p.id !== event.payment_id));
+      }
+      loadSummary();
+    }, {
+      onOpen: () => {
+        loadPendingPayments();
+        loadSummary();
+      },
+      onError: () => setStreamError('Live payment updates stopped. Please log in again.'),
+    });
+  }, [user, loadPendingPayments, loadSummary]);
 
   if (!user) {
     return <div>Loading...</div>;
@@ -18,7 +68,26 @@ export default function ManagerDashboard() {
       <p>Welcome, {user.sub}!</p>
       <p>Your role is: {user.role}</p>
       <p>Your realm is: {user.realm}</p>
-      {/* Room Management, Renter Management, and Payment Approval components will go here */}
+      {streamError && <p>{streamError}</p>}
+      {summaryError && <p>{summaryError}</p>}
+      {pendingError && <p>{pendingError}</p>}
+      {summary && (
+        <div>
+          <h2>Summary</h2>
+          <p>Rooms occupied: {summary.occupied_rooms} of {summary.total_rooms}</p>
+          <p>Payments awaiting approval: {summary.pending_count}</p>
+          <p>Contracts in arrears: {summary.contracts_in_arrears} ({summary.total_arrears} outstanding)</p>
+        </div>
+      )}
+      <h2>Pending Payments ({pendingPayments.length})</h2>
+      <ul>
+        {pendingPayments.map(payment => (
+          <li key={payment.id}>
+            {payment.payment_number}: {payment.amount} on {payment.payment_date}
+          </li>
+        ))}
+      </ul>
+      {/* Room Management and Renter Management components will go here */}
     </div>
   );
 }
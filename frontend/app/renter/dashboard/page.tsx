@@ -1,19 +1,56 @@
 'use client';
 
+import { useEffect, useState } from 'react';
 import { useAuth } from '../../../context/AuthContext';
+import apiClient from '../../../lib/api';
 
 export default function RenterDashboard() {
   const { user } = useAuth();
+  const [dashboard, setDashboard] = useState(null);
+  const [error, setError] = useState(null);
 
-  if (!user) {
+  // Contract, recent payments and balance all come from GET /me/dashboard;
+  // the browser revalidates it with the ETag, so unchanged data costs a 304.
+  useEffect(() => {
+    if (!user) return;
+    apiClient.get('/me/dashboard')
+      .then(response => setDashboard(response.data))
+      .catch(() => setError('Could not load your dashboard. Please try again or log in again.'));
+  }, [user]);
+
+  if (error) {
+    return <div>{error}</div>;
+  }
+
+  if (!user || !dashboard) {
     return <div>Loading...</div>;
   }
 
+  const contract = dashboard.active_contract;
+
   return (
     <div>
       <h1>Renter Dashboard</h1>
       <p>Welcome, {user.sub}!</p>
-      {/* Contract View, Payment History, and Payment Upload components will go here */}
+      <h2>Contract</h2>
+      {contract ? (
+        <p>
+          {contract.contract_number}: {contract.start_date} to {contract.end_date}, {contract.monthly_rate} per month
+        </p>
+      ) : (
+        <p>No active contract found.</p>
+      )}
+      <p>Outstanding balance: {dashboard.outstanding_balance}</p>
+      <p>Payments awaiting approval: {dashboard.pending_count}</p>
+      <h2>Recent Payments</h2>
+      <ul>
+        {dashboard.recent_payments.map(payment => (
+          <li key={payment.id}>
+            {payment.payment_date}: {payment.amount} ({payment.status})
+          </li>
+        ))}
+      </ul>
+      {/* Payment Upload component will go here */}
     </div>
   );
 }
@@ -0,0 +1,111 @@
+import apiClient from './api';
+
+// The native EventSource cannot send an Authorization header, so the
+// payment stream is read with fetch and parsed as Server-Sent Events here.
+
+export type PaymentEvent = {
+  id?: number;
+  type: string;
+  realm?: string;
+  payment_id?: number;
+  contract_id?: number;
+  amount?: number;
+  created_by?: string;
+};
+
+const DEFAULT_RETRY_MS = 5000;
+
+export class PaymentStreamError extends Error {
+  status: number;
+
+  constructor(status: number) {
+    super(`Payment stream failed with status ${status}`);
+    this.status = status;
+  }
+}
+
+type SubscribeOptions = {
+  // Called once, when the stream first opens; state loaded from here
+  // cannot miss an event that arrives between the load and the stream.
+  onOpen?: () => void;
+  // Called when the stream gives up: the token was rejected (401/403).
+  onError?: (error: PaymentStreamError) => void;
+};
+
+export const subscribePaymentEvents = (
+  onEvent: (event: PaymentEvent) => void,
+  { onOpen, onError }: SubscribeOptions = {},
+) => {
+  const controller = new AbortController();
+  let opened = false;
+  let lastEventId: string | null = null;
+  let retryMs = DEFAULT_RETRY_MS;
+
+  const handleBlock = (block: string) => {
+    let data = '';
+    for (const line of block.split('\n')) {
+      if (line.startsWith(':')) continue; // keep-alive comment
+      const [field, ...rest] = line.split(':');
+      const value = rest.join(':').replace(/^ /, '');
+      if (field === 'id') lastEventId = value;
+      else if (field === 'retry') retryMs = Number(value) || retryMs;
+      else if (field === 'data') data += value;
+    }
+    if (data) onEvent(JSON.parse(data));
+  };
+
+  const connect = async () => {
+    const token = localStorage.getItem('jwt_token');
+    const headers: Record<string, string> = { Accept: 'text/event-stream' };
+    if (token) headers.Authorization = `Bearer ${token}`;
+    if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+    const response = await fetch(`${apiClient.defaults.baseURL}/payments/stream`, {
+      headers,
+      signal: controller.signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new PaymentStreamError(response.status);
+    }
+    if (!opened) {
+      opened = true;
+      onOpen?.();
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        handleBlock(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+      }
+    }
+  };
+
+  const run = async () => {
+    while (!controller.signal.aborted) {
+      const startedAt = Date.now();
+      try {
+        await connect();
+        // The server ends long-lived streams on purpose; reconnect straight
+        // away unless the stream closed almost as soon as it opened.
+        if (Date.now() - startedAt >= retryMs) continue;
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        // Retrying a rejected token would only repeat the auth lookup
+        if (error instanceof PaymentStreamError && (error.status === 401 || error.status === 403)) {
+          onError?.(error);
+          return;
+        }
+      }
+      await new Promise(resolve => setTimeout(resolve, retryMs));
+    }
+  };
+
+  run();
+  return () => controller.abort();
+};
@@ -0,0 +1,5 @@
+import os
+
+# Settings are read at import time; these keep the app importable in tests.
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/radius_test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import re
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+# contract_amount_due is plain SQL, so it is checked against a real server
+# when TEST_DATABASE_URL is set.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+SCHEMA = Path(__file__).resolve().parent.parent / "boarding_house_schema_extension.sql"
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+def amount_due(start_date, end_date, monthly_rate, as_of):
+    function_sql = re.search(
+        r"CREATE OR REPLACE FUNCTION contract_amount_due\(.*?\$\$ LANGUAGE sql STABLE;",
+        SCHEMA.read_text(),
+        re.S,
+    ).group(0).replace("FUNCTION contract_amount_due", "FUNCTION pg_temp.contract_amount_due")
+
+    async def run():
+        conn = await asyncpg.connect(TEST_DATABASE_URL)
+        try:
+            await conn.execute(function_sql)
+            return await conn.fetchval(
+                "SELECT pg_temp.contract_amount_due($1, $2, $3, $4)",
+                start_date, end_date, monthly_rate, as_of
+            )
+        finally:
+            await conn.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("start_date, end_date, as_of, months", [
+    # Contract that has not started yet owes nothing
+    (date(2026, 11, 1), date(2027, 10, 31), date(2026, 10, 19), 0),
+    # The first month is due on the start date
+    (date(2026, 10, 19), date(2027, 10, 18), date(2026, 10, 19), 1),
+    (date(2026, 1, 15), date(2026, 12, 31), date(2026, 3, 14), 2),
+    (date(2026, 1, 15), date(2026, 12, 31), date(2026, 3, 15), 3),
+    # Billing stops at end_date
+    (date(2025, 1, 1), date(2025, 6, 30), date(2026, 10, 19), 6),
+    # Month-end start dates roll into the next month's billing a day later
+    (date(2026, 1, 31), date(2026, 12, 31), date(2026, 2, 28), 1),
+    (date(2026, 1, 31), date(2026, 12, 31), date(2026, 3, 1), 2),
+])
+def test_contract_amount_due(start_date, end_date, as_of, months):
+    assert amount_due(start_date, end_date, Decimal("100.00"), as_of) == Decimal("100.00") * months
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+from app.api.me import _dashboard_etag
+from app.sql.contracts import CREATE_CONTRACT
+from app.sql.dashboard import (
+    GET_MANAGER_DASHBOARD,
+    GET_MANAGER_DASHBOARD_VERSION,
+    GET_RENTER_DASHBOARD,
+    GET_RENTER_DASHBOARD_VERSION,
+)
+from app.sql.payments import APPROVE_PAYMENT, CREATE_PAYMENT
+from app.sql.rooms import CREATE_ROOM
+
+# The dashboard queries run against a scratch schema built from the schema
+# script inside a transaction that is rolled back, when TEST_DATABASE_URL
+# is set.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+SCHEMA = Path(__file__).resolve().parent.parent / "boarding_house_schema_extension.sql"
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+REALM = "house-a"
+MANAGER = f"boss@{REALM}"
+TENANT = f"t@{REALM}"
+NEW_TENANT = f"new@{REALM}"
+
+
+def run_in_scratch_schema(test):
+    async def run():
+        conn = await asyncpg.connect(TEST_DATABASE_URL)
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            await conn.execute("""
+                CREATE SCHEMA dashboard_test;
+                SET LOCAL search_path TO dashboard_test;
+                CREATE TABLE radusergroup (
+                    username VARCHAR(64) PRIMARY KEY,
+                    groupname VARCHAR(64) NOT NULL
+                );
+                CREATE TABLE radgroupcheck (
+                    id SERIAL PRIMARY KEY,
+                    groupname VARCHAR(64) NOT NULL,
+                    attribute VARCHAR(64) NOT NULL,
+                    op CHAR(2) NOT NULL,
+                    value VARCHAR(253) NOT NULL
+                );
+            """)
+            await conn.execute(SCHEMA.read_text())
+            return await test(conn)
+        finally:
+            await transaction.rollback()
+            await conn.close()
+
+    return asyncio.run(run())
+
+
+async def seed(conn):
+    await conn.executemany(
+        "INSERT INTO radusergroup (username, groupname) VALUES ($1, $2)",
+        [(MANAGER, "boarding_managers"), (TENANT, "boarding_tenants"), (NEW_TENANT, "boarding_tenants")]
+    )
+    occupied = await conn.fetchval(CREATE_ROOM, REALM, "101", "1", Decimal("100.00"), None, None)
+    await conn.fetchval(CREATE_ROOM, REALM, "102", "1", Decimal("100.00"), None, None)
+    await conn.execute("UPDATE rooms SET status = 'occupied' WHERE id = $1", occupied)
+
+    today = await conn.fetchval("SELECT CURRENT_DATE")
+    start_date = today - timedelta(days=70)
+    contract_id = await conn.fetchval(
+        CREATE_CONTRACT, REALM, "CONT-1", occupied, TENANT,
+        start_date, today + timedelta(days=300), Decimal("100.00"), Decimal("100.00")
+    )
+
+    async def pay(number, amount, created_by):
+        return await conn.fetchval(
+            CREATE_PAYMENT, REALM, contract_id, number, Decimal(amount),
+            today, "Bank Transfer", None, created_by, None
+        )
+
+    approved = await pay("PAY-1", "100.00", TENANT)
+    pending = await pay("PAY-2", "100.00", TENANT)
+    # Recorded by the manager, so it is not among the tenant's own payments
+    by_manager = await pay("PAY-3", "50.00", MANAGER)
+    await conn.execute(APPROVE_PAYMENT, approved, REALM)
+    await conn.execute(APPROVE_PAYMENT, by_manager, REALM)
+
+    amount_due = await conn.fetchval(
+        "SELECT contract_amount_due($1, $2, $3)",
+        start_date, today + timedelta(days=300), Decimal("100.00")
+    )
+    return {"contract_id": contract_id, "pending": pending, "expected_balance": amount_due - Decimal("150.00")}
+
+
+async def etags(conn):
+    renter = await conn.fetchrow(GET_RENTER_DASHBOARD_VERSION, TENANT, REALM)
+    manager = await conn.fetchrow(GET_MANAGER_DASHBOARD_VERSION, REALM)
+    return (
+        _dashboard_etag("boarding_tenants", TENANT, 10, dict(renter)),
+        _dashboard_etag("boarding_managers", MANAGER, 10, dict(manager)),
+    )
+
+
+def test_renter_and_manager_dashboards_agree_on_balance():
+    async def test(conn):
+        seeded = await seed(conn)
+        renter = await conn.fetchrow(GET_RENTER_DASHBOARD, TENANT, REALM, 10)
+        manager = await conn.fetchrow(GET_MANAGER_DASHBOARD, REALM)
+
+        assert seeded["expected_balance"] > 0
+        assert renter["outstanding_balance"] == seeded["expected_balance"]
+        assert manager["total_arrears"] == seeded["expected_balance"]
+        assert manager["contracts_in_arrears"] == 1
+
+        assert json.loads(renter["active_contract"])["id"] == seeded["contract_id"]
+        assert [p["payment_number"] for p in json.loads(renter["recent_payments"])] == ["PAY-2", "PAY-1"]
+        assert renter["pending_count"] == 1
+
+        assert manager["total_rooms"] == 2
+        assert manager["occupied_rooms"] == 1
+        assert manager["available_rooms"] == 1
+        assert manager["active_contracts"] == 1
+        assert manager["pending_count"] == 1
+
+    run_in_scratch_schema(test)
+
+
+def test_renter_dashboard_limits_recent_payments():
+    async def test(conn):
+        await seed(conn)
+        renter = await conn.fetchrow(GET_RENTER_DASHBOARD, TENANT, REALM, 1)
+
+        assert [p["payment_number"] for p in json.loads(renter["recent_payments"])] == ["PAY-2"]
+
+    run_in_scratch_schema(test)
+
+
+def test_renter_dashboard_without_active_contract():
+    async def test(conn):
+        await seed(conn)
+        renter = await conn.fetchrow(GET_RENTER_DASHBOARD, NEW_TENANT, REALM, 10)
+        version = await conn.fetchrow(GET_RENTER_DASHBOARD_VERSION, NEW_TENANT, REALM)
+
+        assert renter["active_contract"] is None
+        assert json.loads(renter["recent_payments"]) == []
+        assert renter["pending_count"] == 0
+        assert renter["outstanding_balance"] is None
+        assert version["contract_id"] is None
+        assert version["payment_count"] == 0
+
+    run_in_scratch_schema(test)
+
+
+def test_approving_a_payment_changes_dashboard_etags():
+    async def test(conn):
+        seeded = await seed(conn)
+        before = await etags(conn)
+
+        assert await etags(conn) == before
+
+        await conn.execute(APPROVE_PAYMENT, seeded["pending"], REALM)
+        after = await etags(conn)
+
+        assert after[0] != before[0]
+        assert after[1] != before[1]
+
+    run_in_scratch_schema(test)
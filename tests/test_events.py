@@ -0,0 +1,199 @@
+import asyncio
+import json
+
+from app import events
+from app.events import (
+    EVENT_BACKLOG_SIZE,
+    RESET_EVENT,
+    SUBSCRIBER_QUEUE_SIZE,
+    PaymentEventBroker,
+    build_payment_event,
+    format_sse,
+)
+
+
+def notify(broker, event_id, realm="house-a", **data):
+    payload = dict(json.loads(build_payment_event("payment_uploaded", realm, 1, **data)))
+    payload["id"] = event_id
+    broker._on_notify(None, 0, "payment_events", json.dumps(payload))
+
+
+def drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_events_fan_out_to_subscribers_of_the_realm_only():
+    broker = PaymentEventBroker("postgresql://unused")
+    first = broker.subscribe("house-a")
+    second = broker.subscribe("house-a")
+    other = broker.subscribe("house-b")
+
+    notify(broker, 1)
+
+    assert [e["id"] for e in drain(first)] == [1]
+    assert [e["id"] for e in drain(second)] == [1]
+    assert drain(other) == []
+
+
+def test_subscribe_replays_events_after_last_event_id_in_order():
+    broker = PaymentEventBroker("postgresql://unused")
+    for event_id in (1, 3, 2, 4):
+        notify(broker, event_id)
+
+    queue = broker.subscribe("house-a", last_event_id="1")
+
+    assert [e["id"] for e in drain(queue)] == [2, 3, 4]
+
+
+def test_subscribe_ignores_malformed_last_event_id():
+    broker = PaymentEventBroker("postgresql://unused")
+    notify(broker, 1)
+
+    queue = broker.subscribe("house-a", last_event_id="not-a-number")
+
+    assert drain(queue) == []
+
+
+def test_notifications_with_bad_ids_or_payloads_are_skipped():
+    broker = PaymentEventBroker("postgresql://unused")
+    queue = broker.subscribe("house-a")
+
+    notify(broker, "abc")
+    notify(broker, None)
+    broker._on_notify(None, 0, "payment_events", "not json")
+    broker._on_notify(None, 0, "payment_events", "[1, 2]")
+
+    assert drain(queue) == []
+    assert list(broker._backlog["house-a"]) == []
+
+
+def test_backlog_is_bounded():
+    broker = PaymentEventBroker("postgresql://unused")
+    for event_id in range(1, EVENT_BACKLOG_SIZE + 11):
+        notify(broker, event_id)
+
+    queue = broker.subscribe("house-a", last_event_id="11")
+
+    assert len(broker._backlog["house-a"]) == EVENT_BACKLOG_SIZE
+    assert [e["id"] for e in drain(queue)] == list(range(12, EVENT_BACKLOG_SIZE + 11))
+
+
+def test_resume_sends_reset_when_backlog_dropped_missed_events():
+    broker = PaymentEventBroker("postgresql://unused")
+    for event_id in range(1, EVENT_BACKLOG_SIZE + 11):
+        notify(broker, event_id)
+
+    queue = broker.subscribe("house-a", last_event_id="5")
+
+    assert drain(queue) == [RESET_EVENT]
+
+
+def test_resume_sends_reset_on_worker_without_earlier_events():
+    broker = PaymentEventBroker("postgresql://unused")
+
+    fresh = broker.subscribe("house-a", last_event_id="5")
+    notify(broker, 8)
+    older = broker.subscribe("house-a", last_event_id="5")
+
+    assert [e.get("id") for e in drain(fresh)] == [None, 8]
+    assert drain(older) == [RESET_EVENT]
+
+
+def test_resume_after_overflow_gets_reset():
+    broker = PaymentEventBroker("postgresql://unused")
+    slow = broker.subscribe("house-a", last_event_id=None)
+    notify(broker, 1)
+    delivered = slow.get_nowait()
+    for event_id in range(2, SUBSCRIBER_QUEUE_SIZE + 3):
+        notify(broker, event_id)
+    assert slow in broker._overflowed
+
+    queue = broker.subscribe("house-a", last_event_id=str(delivered["id"]))
+
+    assert drain(queue) == [RESET_EVENT]
+
+
+def test_unsubscribe_removes_empty_realms():
+    broker = PaymentEventBroker("postgresql://unused")
+    queue = broker.subscribe("house-a")
+
+    broker.unsubscribe("house-a", queue)
+    notify(broker, 1)
+
+    assert "house-a" not in broker._subscribers
+
+
+def test_slow_subscriber_is_dropped_when_its_queue_is_full():
+    broker = PaymentEventBroker("postgresql://unused")
+    slow = broker.subscribe("house-a")
+
+    for event_id in range(1, SUBSCRIBER_QUEUE_SIZE + 2):
+        notify(broker, event_id)
+
+    assert slow in broker._overflowed
+    assert slow not in broker._subscribers["house-a"]
+
+
+def test_stream_ends_after_overflow_once_queue_is_drained():
+    broker = PaymentEventBroker("postgresql://unused")
+
+    async def run():
+        stream = broker.stream("house-a")
+        assert (await stream.__anext__()).startswith("retry:")
+        for event_id in range(1, SUBSCRIBER_QUEUE_SIZE + 2):
+            notify(broker, event_id)
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(run())
+
+    assert len(chunks) == SUBSCRIBER_QUEUE_SIZE
+    assert chunks[-1].startswith(f"id: {SUBSCRIBER_QUEUE_SIZE}\n")
+    assert broker._subscribers == {}
+    assert broker._overflowed == set()
+
+
+def test_broadcast_reaches_every_realm():
+    broker = PaymentEventBroker("postgresql://unused")
+    first = broker.subscribe("house-a")
+    second = broker.subscribe("house-b")
+
+    broker._broadcast({"type": "reset"})
+
+    assert drain(first) == [{"type": "reset"}]
+    assert drain(second) == [{"type": "reset"}]
+
+
+def test_format_sse_omits_id_for_events_without_one():
+    assert format_sse({"type": "reset"}) == 'event: reset\ndata: {"type": "reset"}\n\n'
+    assert format_sse({"id": 7, "type": "payment_approved"}).startswith(
+        "id: 7\nevent: payment_approved\n"
+    )
+
+
+def test_stream_ends_after_its_maximum_lifetime(monkeypatch):
+    monkeypatch.setattr(events, "STREAM_MAX_LIFETIME", 0.05)
+    broker = PaymentEventBroker("postgresql://unused")
+
+    async def run():
+        return [chunk async for chunk in broker.stream("house-a")]
+
+    chunks = asyncio.run(run())
+
+    assert chunks[0].startswith("retry:")
+    assert broker._subscribers == {}
+
+
+def test_stream_ends_once_broker_is_closed(monkeypatch):
+    monkeypatch.setattr(events, "HEARTBEAT_INTERVAL", 0.01)
+    broker = PaymentEventBroker("postgresql://unused")
+
+    async def run():
+        stream = broker.stream("house-a")
+        await stream.__anext__()
+        await broker.close()
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,148 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+
+from app.api import me
+from app.api.me import _dashboard_etag, _etag_matches
+from app.sql.dashboard import (
+    GET_MANAGER_DASHBOARD,
+    GET_MANAGER_DASHBOARD_VERSION,
+    GET_RENTER_DASHBOARD,
+    GET_RENTER_DASHBOARD_VERSION,
+)
+
+MANAGER = {"username": "boss@house-a", "role": "boarding_managers", "realm": "house-a"}
+TENANT = {"username": "t@house-a", "role": "boarding_tenants", "realm": "house-a"}
+VERSION = {"today": date(2026, 10, 19), "room_count": 4, "payment_count": 7}
+SUMMARY = {"total_rooms": 4, "occupied_rooms": 3, "pending_count": 1}
+# asyncpg hands json columns back as text
+RENTER = {
+    "active_contract": '{"id": 3, "contract_number": "CONT-1", "monthly_rate": 100.00}',
+    "recent_payments": '[{"id": 9, "amount": 100.00, "status": "pending"}]',
+    "pending_count": 1,
+    "outstanding_balance": Decimal("150.00"),
+}
+RENTER_WITHOUT_CONTRACT = {
+    "active_contract": None,
+    "recent_payments": "[]",
+    "pending_count": 0,
+    "outstanding_balance": None,
+}
+
+
+def test_dashboard_etag_is_stable_and_quoted():
+    etag = _dashboard_etag("boarding_managers", "boss@house-a", 10, VERSION)
+
+    assert etag == _dashboard_etag("boarding_managers", "boss@house-a", 10, dict(VERSION))
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_dashboard_etag_changes_with_version_and_limit():
+    etag = _dashboard_etag("boarding_tenants", "t@house-a", 10, VERSION)
+
+    assert etag != _dashboard_etag("boarding_tenants", "t@house-a", 10, {**VERSION, "payment_count": 8})
+    assert etag != _dashboard_etag("boarding_tenants", "t@house-a", 20, VERSION)
+
+
+def test_etag_matches_strong_weak_lists_and_wildcard():
+    etag = '"abc"'
+
+    assert _etag_matches(etag, '"abc"')
+    assert _etag_matches(etag, 'W/"abc"')
+    assert _etag_matches(etag, '"other", W/"abc"')
+    assert _etag_matches(etag, "*")
+    assert not _etag_matches(etag, '"other"')
+    assert not _etag_matches(etag, None)
+    assert not _etag_matches(etag, "")
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def transaction(self, **kwargs):
+        @asynccontextmanager
+        async def transaction():
+            yield
+        return transaction()
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        return self.rows[query]
+
+
+MANAGER_ROWS = {GET_MANAGER_DASHBOARD_VERSION: VERSION, GET_MANAGER_DASHBOARD: SUMMARY}
+
+
+def call_dashboard(monkeypatch, if_none_match=None, user=MANAGER, rows=MANAGER_ROWS):
+    conn = FakeConnection(rows)
+
+    @asynccontextmanager
+    async def get_db_connection():
+        yield conn
+
+    monkeypatch.setattr(me, "get_db_connection", get_db_connection)
+    response = asyncio.run(me.get_my_dashboard(
+        payments_limit=10, if_none_match=if_none_match, current_user=user
+    ))
+    return response, conn.queries
+
+
+def test_dashboard_returns_summary_with_etag(monkeypatch):
+    response, queries = call_dashboard(monkeypatch)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {"role": "boarding_managers", **SUMMARY}
+    assert queries == [GET_MANAGER_DASHBOARD_VERSION, GET_MANAGER_DASHBOARD]
+
+
+def test_dashboard_skips_aggregate_when_etag_matches(monkeypatch):
+    first, _ = call_dashboard(monkeypatch)
+
+    response, queries = call_dashboard(monkeypatch, "W/" + first.headers["etag"])
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == first.headers["etag"]
+    assert queries == [GET_MANAGER_DASHBOARD_VERSION]
+
+
+def test_renter_dashboard_decodes_contract_and_payments(monkeypatch):
+    rows = {GET_RENTER_DASHBOARD_VERSION: VERSION, GET_RENTER_DASHBOARD: RENTER}
+
+    response, queries = call_dashboard(monkeypatch, user=TENANT, rows=rows)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {
+        "role": "boarding_tenants",
+        "active_contract": {"id": 3, "contract_number": "CONT-1", "monthly_rate": 100.0},
+        "recent_payments": [{"id": 9, "amount": 100.0, "status": "pending"}],
+        "pending_count": 1,
+        "outstanding_balance": 150.0,
+    }
+    assert queries == [GET_RENTER_DASHBOARD_VERSION, GET_RENTER_DASHBOARD]
+
+
+def test_renter_dashboard_without_active_contract(monkeypatch):
+    rows = {GET_RENTER_DASHBOARD_VERSION: VERSION, GET_RENTER_DASHBOARD: RENTER_WITHOUT_CONTRACT}
+
+    response, _ = call_dashboard(monkeypatch, user=TENANT, rows=rows)
+
+    assert json.loads(response.body) == {
+        "role": "boarding_tenants",
+        "active_contract": None,
+        "recent_payments": [],
+        "pending_count": 0,
+        "outstanding_balance": 0,
+    }
+
+
+def test_renter_and_manager_etags_differ_for_same_version(monkeypatch):
+    rows = {GET_RENTER_DASHBOARD_VERSION: VERSION, GET_RENTER_DASHBOARD: RENTER}
+
+    renter, _ = call_dashboard(monkeypatch, user=TENANT, rows=rows)
+    manager, _ = call_dashboard(monkeypatch)
+
+    assert renter.headers["etag"] != manager.headers["etag"]
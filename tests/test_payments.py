@@ -0,0 +1,77 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import payments
+from app.events import PAYMENT_EVENTS_CHANNEL
+from app.sql.payments import NOTIFY_PAYMENT_EVENT
+
+MANAGER = {"username": "boss@house-a", "role": "boarding_managers", "realm": "house-a"}
+
+
+class RecordingConnection:
+    def __init__(self, row):
+        self.row = row
+        self.executed = []
+        self.in_transaction = False
+        self.executed_in_transaction = []
+
+    def transaction(self):
+        @asynccontextmanager
+        async def transaction():
+            self.in_transaction = True
+            try:
+                yield
+            finally:
+                self.in_transaction = False
+        return transaction()
+
+    async def fetchrow(self, query, *args):
+        return self.row
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+        self.executed_in_transaction.append(self.in_transaction)
+
+
+def use_connection(monkeypatch, conn):
+    @asynccontextmanager
+    async def get_db_connection():
+        yield conn
+
+    monkeypatch.setattr(payments, "get_db_connection", get_db_connection)
+
+
+def test_approve_payment_notifies_with_numeric_amount(monkeypatch):
+    conn = RecordingConnection({"id": 5, "contract_id": 9, "amount": Decimal("100.00")})
+    use_connection(monkeypatch, conn)
+
+    asyncio.run(payments.approve_payment(5, current_user=MANAGER))
+
+    [(query, (channel, payload))] = conn.executed
+    assert query == NOTIFY_PAYMENT_EVENT
+    assert channel == PAYMENT_EVENTS_CHANNEL
+    assert json.loads(payload) == {
+        "type": "payment_approved",
+        "realm": "house-a",
+        "payment_id": 5,
+        "contract_id": 9,
+        "amount": 100.0,
+    }
+    assert conn.executed_in_transaction == [True]
+
+
+def test_approve_payment_does_not_notify_when_nothing_changed(monkeypatch):
+    conn = RecordingConnection(None)
+    use_connection(monkeypatch, conn)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(payments.approve_payment(5, current_user=MANAGER))
+
+    assert exc.value.status_code == 404
+
+    assert conn.executed == []